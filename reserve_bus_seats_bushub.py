@@ -2,23 +2,379 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import asyncio
+import codecs
+import contextvars
+import heapq
+import importlib.util
 import json
 import logging
 import os
 import re
+import sys
+import threading
 import time
-from datetime import datetime, timedelta
+from array import array
+from datetime import date, datetime, timedelta, timezone
 
 import requests
 import yaml
 from bs4 import BeautifulSoup
 
+try:
+    import fcntl
+except ImportError:  # Windows, the seat history lock is then per process only
+    fcntl = None
+
 # configuring the logger to info log levek
 log = logging.getLogger()
 logging.basicConfig(level=logging.INFO)
 
+# httpx logs every request at INFO, which would drown out the poll messages
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# seconds to wait for BusHub before giving up on a request, on both transports
+HTTP_TIMEOUT = 30
+
+# shared session so every BusHub request reuses the same connection pool
+http_session = requests.Session()
+http_session.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+
+# httpx.AsyncClient of the running event loop, see run_on_event_loop.
+# When unset, requests are sent through http_session from worker threads.
+_async_http_session = contextvars.ContextVar("async_http_session", default=None)
+
+
+def new_async_http_session():
+    """
+    httpx.AsyncClient sending requests the same way as http_session
+    (following redirects, HTTP_TIMEOUT seconds per request).
+    """
+    try:
+        import httpx
+    except ImportError:
+        log.error("🚩 The async HTTP client needs httpx: pip install httpx")
+        raise
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+
+
+def _response_ok(response):
+    # requests responses have .ok, httpx responses don't
+    return response.status_code < 400
+
+
+def _send(method, url, kwargs):
+    """Send a request built by one of the _*_request functions."""
+    return getattr(http_session, method.lower())(url, timeout=HTTP_TIMEOUT, **kwargs)
+
+
+async def _send_async(method, url, kwargs):
+    """
+    Send a request built by one of the _*_request functions from the event
+    loop, with httpx if the loop has a client, otherwise with a blocking
+    request in a worker thread.
+    """
+    client = _async_http_session.get()
+    if client is None:
+        return await asyncio.to_thread(_send, method, url, kwargs)
+    kwargs = dict(kwargs)
+    # httpx takes a raw request body as content rather than data
+    if "data" in kwargs:
+        kwargs["content"] = kwargs.pop("data")
+    return await client.request(method, url, **kwargs)
+
+
+def run_on_event_loop(mode, *args, use_httpx=False, **kwargs):
+    """
+    Run one of the async modes on a fresh event loop and return its result.
+    With use_httpx, requests go through an httpx.AsyncClient kept for the
+    run, otherwise through http_session from worker threads.
+    Ctrl-C cancels every pending timer and request.
+    """
+
+    async def runner():
+        client = new_async_http_session() if use_httpx else None
+        # set in the context of this run only, tasks started from it inherit the client
+        _async_http_session.set(client)
+        try:
+            return await mode(*args, **kwargs)
+        finally:
+            if client is not None:
+                await client.aclose()
+
+    try:
+        return asyncio.run(runner())
+    except KeyboardInterrupt:
+        log.info("🛑 Stopped by user.")
+        return False
+
+
+async def wait_or_stop(seconds, stop=None):
+    """
+    Cancellable timer used on the event loop in place of time.sleep.
+    Returns True as soon as `stop` is set, or False once `seconds` have passed.
+    """
+    if stop is None:
+        await asyncio.sleep(max(seconds, 0))
+        return False
+    try:
+        await asyncio.wait_for(stop.wait(), max(seconds, 0))
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def _raise_interrupts(results):
+    """
+    gather(return_exceptions=True) also returns exceptions that should end
+    the run, such as KeyboardInterrupt; raise those again.
+    """
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return results
+
+
+def _to_epoch(dt):
+    """
+    Convert a (naive local or aware) datetime into integer epoch seconds.
+    Returns (epoch, utc offset in seconds or None for naive datetimes).
+    """
+    offset = dt.utcoffset()
+    return int(dt.timestamp()), (
+        int(offset.total_seconds()) if offset is not None else None
+    )
+
+
+def _from_epoch(epoch, utc_offset=None):
+    if utc_offset is None:
+        return datetime.fromtimestamp(epoch)
+    return datetime.fromtimestamp(epoch, timezone(timedelta(seconds=utc_offset)))
+
+
+class Departure:
+    """
+    Compact record of one bus departure returned by the availability endpoint.
+    Departure time is held as epoch seconds, stop codes are interned and
+    seat counts are plain ints, so thousands of snapshots stay cheap to keep.
+    """
+
+    __slots__ = (
+        "departure",
+        "utc_offset",
+        "line_id",
+        "pickup",
+        "dropoff",
+        "bookings",
+        "capacity",
+    )
+
+    def __init__(
+        self, departure, line_id, pickup, dropoff, bookings, capacity, utc_offset=None
+    ):
+        self.departure = departure
+        self.utc_offset = utc_offset
+        # keep the API's type for lineId as it is sent back when reserving
+        self.line_id = sys.intern(line_id) if isinstance(line_id, str) else line_id
+        self.pickup = sys.intern(pickup) if pickup else None
+        self.dropoff = sys.intern(dropoff) if dropoff else None
+        self.bookings = int(bookings)
+        self.capacity = int(capacity)
+
+    @classmethod
+    def from_dict(cls, item, pickup=None, dropoff=None):
+        scheduled = item["scheduledDepartureTime"]
+        if isinstance(scheduled, str):
+            scheduled = datetime.fromisoformat(scheduled)
+        epoch, utc_offset = _to_epoch(scheduled)
+        return cls(
+            epoch,
+            item["lineId"],
+            item.get("pickupAtcocode", pickup),
+            item.get("dropoffAtcocode", dropoff),
+            item["bookingOptions"]["bookings"],
+            item["bookingOptions"]["capacity"],
+            utc_offset,
+        )
+
+    def to_dict(self):
+        return {
+            "scheduledDepartureTime": self.isoformat(),
+            "lineId": self.line_id,
+            "pickupAtcocode": self.pickup,
+            "dropoffAtcocode": self.dropoff,
+            "bookingOptions": {"bookings": self.bookings, "capacity": self.capacity},
+        }
+
+    def as_datetime(self):
+        return _from_epoch(self.departure, self.utc_offset)
+
+    def isoformat(self):
+        return self.as_datetime().isoformat()
+
+    @property
+    def day(self):
+        """Date of departure as a proleptic Gregorian ordinal."""
+        return self.as_datetime().toordinal()
+
+    @property
+    def seats_left(self):
+        return self.capacity - self.bookings
+
+    def __repr__(self):
+        return f"Departure({self.isoformat()}, line={self.line_id}, {self.bookings}/{self.capacity})"
+
+
+class Reservation:
+    """
+    Compact record of one row in the bookings table.
+    The column headers are shared between all rows of a fetch and only the
+    cell values are kept per row, alongside the parsed departure epoch,
+    the date ordinal, the (interned) status and the cancellation id.
+    """
+
+    __slots__ = ("departure", "day", "status", "cancel_id", "columns", "values")
+
+    def __init__(self, departure, status="", cancel_id=None, columns=(), values=()):
+        self.departure = departure
+        self.day = datetime.fromtimestamp(departure).toordinal()
+        self.status = sys.intern(status)
+        self.cancel_id = int(cancel_id) if cancel_id else None
+        self.columns = columns
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, row_data):
+        departure = datetime.strptime(
+            row_data["Date"] + " " + row_data["Time"], "%d/%m/%Y %H:%M"
+        )
+        columns = tuple(
+            key
+            for key in row_data
+            if key not in ("", "datetimeISO", "dateISO", "cancel_id")
+        )
+        return cls(
+            int(departure.timestamp()),
+            row_data.get("", ""),
+            row_data.get("cancel_id"),
+            columns,
+            tuple(sys.intern(row_data[key]) for key in columns),
+        )
+
+    def to_dict(self):
+        row_data = dict(zip(self.columns, self.values))
+        row_data[""] = self.status
+        row_data["datetimeISO"] = self.as_datetime().isoformat()
+        row_data["dateISO"] = self.date
+        row_data["cancel_id"] = str(self.cancel_id) if self.cancel_id else None
+        return row_data
+
+    def as_datetime(self):
+        return datetime.fromtimestamp(self.departure)
+
+    @property
+    def date(self):
+        return date.fromordinal(self.day)
+
+    @property
+    def cancelled(self):
+        return self.status == "Cancelled"
+
+    @property
+    def is_pm(self):
+        return self.as_datetime().hour >= 12
+
+    def __repr__(self):
+        return f"Reservation({self.as_datetime().isoformat()}, status={self.status!r}, cancel_id={self.cancel_id})"
+
+
+# cache of ISO dates on which no buses run, see load_closed_dates
+_closed_dates = None
+
+LEARNED_CLOSURES_FILE = "learned_closures.txt"
+# learned closures are guesses from a single reply, so they are retried after a day
+LEARNED_CLOSURE_TTL = 24 * 3600
+# cache of {(ISO date, LINE_ID): epoch learned}, see load_learned_closures
+_learned_closures = None
+
+
+def load_closed_dates(filename="closures.yaml"):
+    """
+    Load the bank holidays and site closures from closures.yaml as a set of
+    ISO date strings. The set is read once and cached for the rest of the run.
+    """
+    global _closed_dates
+    if _closed_dates is None:
+        _closed_dates = set()
+        if os.path.exists(filename):
+            with open(filename, "r") as file:
+                calendar = yaml.safe_load(file) or {}
+            for key in ["bank_holidays", "site_closures"]:
+                for day in calendar.get(key) or []:
+                    _closed_dates.add(str(day))
+    return _closed_dates
+
+
+def load_learned_closures(filename=None):
+    """
+    Load the services BusHub reported as not running on a date, kept apart
+    from closures.yaml in lines of `date,LINE_ID,epoch learned`.
+    Entries older than LEARNED_CLOSURE_TTL are dropped, and the file is
+    rewritten without them so it doesn't keep growing.
+    """
+    global _learned_closures
+    expired = time.time() - LEARNED_CLOSURE_TTL
+    if _learned_closures is None:
+        _learned_closures = {}
+        filename = filename or LEARNED_CLOSURES_FILE
+        if os.path.exists(filename):
+            with open(filename) as file:
+                lines = file.readlines()
+            for line in lines:
+                fields = line.strip().split(",")
+                if len(fields) != 3 or not fields[2].isdigit() or int(fields[2]) < expired:
+                    continue
+                travel_date, line_id, learned_at = fields
+                _learned_closures[(travel_date, line_id)] = int(learned_at)
+            if len(_learned_closures) != len(lines):
+                with open(filename, "w") as file:
+                    for (travel_date, line_id), learned_at in _learned_closures.items():
+                        file.write(f"{travel_date},{line_id},{learned_at}\n")
+    for key in [key for key, learned_at in _learned_closures.items() if learned_at < expired]:
+        del _learned_closures[key]
+    return _learned_closures
+
+
+def is_service_closed(travel_date, LINE_ID):
+    """
+    True if BusHub recently reported that LINE_ID does not run on travel_date.
+    """
+    return (travel_date, str(LINE_ID)) in load_learned_closures()
+
+
+def record_service_closure(travel_date, LINE_ID, filename=None):
+    """
+    Remember that BusHub reported LINE_ID as not running on travel_date,
+    so that service is skipped for that date until the entry expires.
+    """
+    learned = load_learned_closures()
+    if (travel_date, str(LINE_ID)) in learned:
+        return
+    learned_at = int(time.time())
+    learned[(travel_date, str(LINE_ID))] = learned_at
+    with open(filename or LEARNED_CLOSURES_FILE, "a") as file:
+        file.write(f"{travel_date},{LINE_ID},{learned_at}\n")
+    log.info(f"📆 Learned that service {LINE_ID} does not run on {travel_date}")
+
 
 def get_upcoming_dates(start_date):
+    closed_dates = load_closed_dates()
     if start_date is None:
         start_date = datetime.now()
         start_date += timedelta(days=1)
@@ -32,16 +388,89 @@ def get_upcoming_dates(start_date):
     # Loop through the days
     current_date = start_date
     while current_date <= end_date:
-        # Check if the day is a weekend
+        # Check if the day is a weekend, bank holiday or closure
         if current_date.weekday() < 5:  # 0-4 denotes Monday to Friday
             # Add the date to the list in ISO format
-            date_list.append(current_date.date().isoformat())
+            if current_date.date().isoformat() not in closed_dates:
+                date_list.append(current_date.date().isoformat())
         # Move to the next day
         current_date += timedelta(days=1)
 
     return date_list
 
 
+# directory of the seat history log, set to None to stop recording polls
+SEAT_HISTORY_DIR = "seat_history"
+
+# one file per column, each an append-only array of fixed width ints
+SEAT_HISTORY_COLUMNS = [
+    ("poll_time", "q"),
+    ("service", "i"),
+    ("departure", "q"),
+    ("bookings", "h"),
+    ("capacity", "h"),
+]
+
+_seat_history_lock = threading.Lock()
+
+
+def _seat_history_services(services_file):
+    """
+    Read services.txt into {service key: index}. Call with the history lock held,
+    so the indices are current when a new service is added.
+    """
+    services = {}
+    if os.path.exists(services_file):
+        with open(services_file) as file:
+            for index, line in enumerate(file):
+                services[line.rstrip("\n")] = index
+    return services
+
+
+def record_seat_history(departures, poll_time=None, history_dir=None):
+    """
+    Append one row per departure (poll time, service, departure, bookings,
+    capacity) to the columnar seat history log.
+    Services are stored as their index in services.txt. The whole batch is
+    written under an exclusive lock on the history directory (where fcntl
+    is available), so several running modes can share the log without
+    reusing an index or misaligning the column files.
+    """
+    history_dir = history_dir or SEAT_HISTORY_DIR
+    if not history_dir or not departures:
+        return
+    if poll_time is None:
+        poll_time = int(time.time())
+
+    with _seat_history_lock:
+        os.makedirs(history_dir, exist_ok=True)
+        with open(os.path.join(history_dir, ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            services_file = os.path.join(history_dir, "services.txt")
+            services = _seat_history_services(services_file)
+            keys = [f"{bus.line_id},{bus.pickup},{bus.dropoff}" for bus in departures]
+            new_keys = [key for key in dict.fromkeys(keys) if key not in services]
+            if new_keys:
+                with open(services_file, "a") as file:
+                    for key in new_keys:
+                        services[key] = len(services)
+                        file.write(f"{key}\n")
+
+            rows = {
+                "poll_time": [poll_time] * len(departures),
+                "service": [services[key] for key in keys],
+                "departure": [bus.departure for bus in departures],
+                "bookings": [bus.bookings for bus in departures],
+                "capacity": [bus.capacity for bus in departures],
+            }
+            for name, typecode in SEAT_HISTORY_COLUMNS:
+                with open(os.path.join(history_dir, f"{name}.bin"), "ab") as file:
+                    array(typecode, rows[name]).tofile(file)
+            # the lock is released when lock_file is closed
+
+
 def login_and_save_cookie(username, password):
     # Define the login page and endpoint URLs
     login_page_url = "https://wellcomegenomecampus.bushub.co.uk/"
@@ -91,17 +520,164 @@ def login_and_save_cookie(username, password):
             raise Exception(response.raise_for_status())
 
 
-def get_bus_stops(COOKIE):
+# tokens that change nesting depth or start a string when scanning JSON text
+_JSON_TOKEN = re.compile(r'[{}\[\]"]')
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_JSON_ELEMENT_START = re.compile(r"[^\s,]")
+_JSON_SPACE = re.compile(r"\s*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+class JSONArrayItemParser:
+    """
+    Push parser for the elements of the top level array `key` of a
+    JSON document. Text chunks are passed to feed() as they arrive, which
+    returns the elements completed so far; only the element being read is
+    kept in memory, never the whole document.
+    """
+
+    def __init__(self, key="items"):
+        self.key = f'"{key}"'
+        self.buffer = ""
+        self.i = 0
+        self.depth = 0
+        # a string was read at depth 1 and may be a key, awaiting its ':'
+        self.awaiting_colon = False
+        self.key_string = False
+        self.found_key = False
+        self.in_array = False
+        # chunks held back until the buffer reaches retry_at, the length at
+        # which a cut off element is decoded again
+        self.pending = []
+        self.pending_size = 0
+        self.retry_at = 0
+        self.done = False
+
+    def feed(self, chunk):
+        self.pending.append(chunk)
+        self.pending_size += len(chunk)
+        if len(self.buffer) + self.pending_size < self.retry_at:
+            return []
+        self.buffer += "".join(self.pending)
+        self.pending, self.pending_size = [], 0
+        return list(self._scan())
+
+    def close(self):
+        """Returns the elements still buffered, raises if the array is cut off."""
+        self.buffer += "".join(self.pending)
+        self.pending, self.pending_size = [], 0
+        items = list(self._scan(final=True))
+        if self.in_array and not self.done:
+            raise ValueError(f"JSON array {self.key} is truncated")
+        return items
+
+    def _scan(self, final=False):
+        while not self.done:
+            if not self.in_array:
+                if not self._seek_array():
+                    return
+                continue
+
+            # read the array one element at a time
+            m = _JSON_ELEMENT_START.search(self.buffer, self.i)
+            if m is None:
+                self.buffer, self.i = "", 0
+                return
+            if m.group() == "]":
+                self.done = True
+                return
+
+            # elements are decoded by the C json scanner straight from the buffer,
+            # one cut off at the end of the chunk fails and is retried once the
+            # buffer has doubled, so each element is decoded a bounded number of times
+            try:
+                item, end = _JSON_DECODER.raw_decode(self.buffer, m.start())
+            except json.JSONDecodeError:
+                if final:
+                    return
+                self.buffer, self.i = self.buffer[m.start() :], 0
+                self.retry_at = 2 * len(self.buffer)
+                return
+            if not isinstance(item, (dict, list)):
+                # a scalar is only complete once the ',' or ']' after it is read,
+                # -2 may be the start of -2.5 cut off in the next chunk
+                after = _JSON_SPACE.match(self.buffer, end).end()
+                if after == len(self.buffer) or self.buffer[after] not in ",]":
+                    if final:
+                        if after < len(self.buffer):
+                            raise ValueError(
+                                f"JSON array {self.key} has an invalid element"
+                            )
+                        return
+                    self.buffer, self.i = self.buffer[m.start() :], 0
+                    self.retry_at = len(self.buffer) + 1
+                    return
+            self.i = end
+            self.retry_at = 0
+            yield item
+
+    def _seek_array(self):
+        """
+        Advance towards the array value of `key` in the top level object.
+        Returns False when more data is needed.
+        """
+        if self.awaiting_colon:
+            # a key is followed by ':', a string value is not a key
+            colon = _JSON_SPACE.match(self.buffer, self.i).end()
+            if colon == len(self.buffer):
+                return False
+            self.found_key = self.key_string and self.buffer[colon] == ":"
+            self.awaiting_colon = False
+
+        m = _JSON_TOKEN.search(self.buffer, self.i)
+        if m is None:
+            self.buffer, self.i = "", 0
+            return False
+        token = m.group()
+        if token == '"':
+            s = _JSON_STRING.match(self.buffer, m.start())
+            if s is None:
+                self.buffer, self.i = self.buffer[m.start() :], 0
+                return False
+            self.i = s.end()
+            self.awaiting_colon = True
+            self.key_string = self.depth == 1 and s.group() == self.key
+            return True
+
+        self.i = m.end()
+        if token == "[" and self.found_key:
+            self.in_array = True
+        else:
+            self.found_key = False
+            self.depth += 1 if token in "{[" else -1
+        return True
+
+
+def iter_json_array_items(chunks, key="items"):
     """
-    Fetches bus stop information from the BusHub API.
-    Returns a dictionary mapping bus route numbers to their stops.
+    Incrementally yield the object elements of the top level array `key`
+    from a JSON document arriving as text chunks.
     """
+    parser = JSONArrayItemParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.close()
+
+
+def _bus_stops_request(COOKIE):
     url = "https://nextstopapp.bushub.co.uk/api/v1.0/service/region/490"
 
     # Get next weekday date in ISO format for the query parameter
     current_date = datetime.now()
     next_weekday = current_date + timedelta(days=1)
-    while next_weekday.weekday() >= 5:  # Skip weekends (5=Saturday, 6=Sunday)
+    # Skip weekends (5=Saturday, 6=Sunday), bank holidays and closures
+    closed_dates = load_closed_dates()
+    while (
+        next_weekday.weekday() >= 5
+        or next_weekday.date().isoformat() in closed_dates
+    ):
         next_weekday += timedelta(days=1)
 
     current_date = next_weekday.isoformat()
@@ -117,70 +693,101 @@ def get_bus_stops(COOKIE):
     }
 
     params = {"date": current_date, "includeRunBy": "true", "canBook": "true"}
+    return "GET", url, {"headers": headers, "params": params}
 
-    response = requests.get(url, headers=headers, params=params)
-    if not response.ok:
+
+def _check_bus_stops_response(response):
+    if not _response_ok(response):
         log.error("🚩 Failed to fetch bus stop information")
         log.error(response.text)
         raise Exception(response.raise_for_status())
 
-    data = response.json()
-    bus_routes = []
 
-    for item in data["items"]:
-        if "lineId" not in item:
-            log.error("🚩 No lineId found for bus route")
+def _route_stop_tuples(item):
+    """
+    (lineId, name, direction, atcoCode, stop name) tuples of one route item
+    of the region response, with its AM stops before its PM stops.
+    """
+    if "lineId" not in item:
+        log.error("🚩 No lineId found for bus route")
+        return
+
+    line_id = item["lineId"]
+    name = item.get("name")
+
+    # keep the stops of this route only until its AM ones are out
+    pm_stops = []
+    for pattern in item.get("journeyPatterns", []):
+        if not pattern.get("busHubRouteRefs"):
             continue
+        # Extract stops from journey patterns
+        for stop in pattern["journeyPatterns"]:
+            if "atcoCode" not in stop or "name" not in stop:
+                continue
+            stop_info = (stop["atcoCode"], stop["name"])
 
-        # Create separate services for AM and PM directions
-        am_service = {
-            "Service": item["lineId"],
-            "name": item.get("name"),
-            "direction": "AM",
-            "stops": [],
-        }
+            # Assign stop to appropriate direction service
+            # If no direction field, add to both (fallback)
+            direction = stop.get("direction")
+            if direction in (2, None):
+                yield (line_id, name, "AM") + stop_info
+            if direction in (1, None):
+                pm_stops.append(stop_info)
+
+    for stop_info in pm_stops:
+        yield (line_id, name, "PM") + stop_info
 
-        pm_service = {
-            "Service": item["lineId"],
-            "name": item.get("name"),
-            "direction": "PM",
-            "stops": [],
-        }
 
-        if "journeyPatterns" in item:
-            for pattern in item["journeyPatterns"]:
-                if "busHubRouteRefs" in pattern and pattern["busHubRouteRefs"]:
-                    # Extract stops from journey patterns
-                    for stop in pattern["journeyPatterns"]:
-                        if "atcoCode" in stop and "name" in stop:
-                            stop_info = {
-                                "atcoCode": stop["atcoCode"],
-                                "name": stop["name"],
-                            }
-
-                            # Assign stop to appropriate direction service
-                            if "direction" in stop:
-                                if stop["direction"] == 2:
-                                    am_service["stops"].append(stop_info)
-                                elif stop["direction"] == 1:
-                                    pm_service["stops"].append(stop_info)
-                            else:
-                                # If no direction field, add to both (fallback)
-                                am_service["stops"].append(stop_info)
-                                pm_service["stops"].append(stop_info)
-
-        # Only add services that have stops
-        if am_service["stops"]:
-            bus_routes.append(am_service)
-        if pm_service["stops"]:
-            bus_routes.append(pm_service)
-
-    return bus_routes
+def get_bus_stops(COOKIE):
+    """
+    Streams bus stop information from the BusHub API.
+    Yields (lineId, name, direction, atcoCode, stop name) tuples, with the
+    AM stops of a route before its PM stops, as the response arrives.
+    """
+    _, url, kwargs = _bus_stops_request(COOKIE)
+    with http_session.get(
+        url, stream=True, timeout=HTTP_TIMEOUT, **kwargs
+    ) as response:
+        _check_bus_stops_response(response)
+
+        chunks = codecs.iterdecode(response.iter_content(chunk_size=65536), "utf-8")
+        for item in iter_json_array_items(chunks, "items"):
+            yield from _route_stop_tuples(item)
+
+
+async def get_bus_stops_async(COOKIE):
+    """
+    Streams bus stop information from the BusHub API on the event loop.
+    Yields the same tuples as get_bus_stops.
+    """
+    client = _async_http_session.get()
+    if client is None:
+        # without httpx the blocking stream is read in a worker thread
+        for stop in await asyncio.to_thread(lambda: list(get_bus_stops(COOKIE))):
+            yield stop
+        return
+
+    method, url, kwargs = _bus_stops_request(COOKIE)
+    async with client.stream(method, url, **kwargs) as response:
+        if not _response_ok(response):
+            await response.aread()
+        _check_bus_stops_response(response)
+
+        parser = JSONArrayItemParser("items")
+        async for chunk in response.aiter_text():
+            for item in parser.feed(chunk):
+                for stop in _route_stop_tuples(item):
+                    yield stop
+            if parser.done:
+                return
+        for item in parser.close():
+            for stop in _route_stop_tuples(item):
+                yield stop
 
 
 def generate_busroutes_yaml(bus_stops_data, existing_config=None):
     """
-    Generate busroutes.yaml structure from bus stops data.
+    Generate busroutes.yaml structure from the stop tuples of get_bus_stops.
     Preserves existing route mappings if available.
     """
     if existing_config is None:
@@ -202,12 +809,8 @@ def generate_busroutes_yaml(bus_stops_data, existing_config=None):
     # Generate new structure
     new_routes = {}
 
-    # Process each service from the bus_stops_data list
-    for service_data in bus_stops_data:
-        service_id = service_data["Service"]
-        direction = service_data["direction"]
-        route_name = service_data["name"]
-
+    # Add each stop straight into its route and period
+    for service_id, route_name, direction, atco_code, stop_name in bus_stops_data:
         # Check if this service already has a mapping
         if service_id in service_to_route_mapping:
             mapping = service_to_route_mapping[service_id]
@@ -225,9 +828,7 @@ def generate_busroutes_yaml(bus_stops_data, existing_config=None):
         if period not in new_routes[route_code]:
             new_routes[route_code][period] = {"Service": str(service_id), "Stops": {}}
 
-        # Add all stops for this service
-        for stop in service_data["stops"]:
-            new_routes[route_code][period]["Stops"][stop["name"]] = stop["atcoCode"]
+        new_routes[route_code][period]["Stops"][stop_name] = atco_code
 
     return new_routes
 
@@ -245,7 +846,7 @@ def save_busroutes_yaml(bus_routes_data, filename="busroutes.yaml"):
         raise
 
 
-def get_available_buses(TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE):
+def _available_buses_request(TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE):
     url_get_buses = f"https://nextstopapp.bushub.co.uk/api/v1.0/service/{LINE_ID}/bookings/times?date={TRAVEL_DATE}&pickupAtcocode={PICKUP_ATCOCODE}&dropoffAtcocode={DROPOFF_ATCOCODE}"
 
     headers_get_buses = {
@@ -258,9 +859,12 @@ def get_available_buses(TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE)
         f"🚍 for buses on route: {LINE_ID}, on {TRAVEL_DATE} between stops: {PICKUP_ATCOCODE} and {DROPOFF_ATCOCODE}"
     )
 
-    # make the request and raise an exception if it fails
-    response = requests.get(url_get_buses, headers=headers_get_buses)
-    if not response.ok:
+    return "GET", url_get_buses, {"headers": headers_get_buses}
+
+
+def _parse_available_buses(response, PICKUP_ATCOCODE, DROPOFF_ATCOCODE):
+    # raise an exception if the request failed
+    if not _response_ok(response):
         log.error(
             "🚩 Something went wrong with request to fetch list of buses for this route. The request was not successful"
         )
@@ -276,38 +880,65 @@ def get_available_buses(TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE)
         )
         raise Exception()
 
-    # Convert "scheduledDepartureTime" to datetime and sort items
-    for item in items:
-        item["scheduledDepartureTime"] = datetime.fromisoformat(
-            item["scheduledDepartureTime"]
-        )
+    # Convert items to compact records and sort
+    # by departure in descending order (from latest to earliest)
+    departures = [
+        Departure.from_dict(item, PICKUP_ATCOCODE, DROPOFF_ATCOCODE) for item in items
+    ]
+    departures.sort(key=lambda x: x.departure, reverse=True)
+    return departures
 
-    # sort by "scheduledDepartureTime" in descending order
-    # from latest to earliest
-    items.sort(key=lambda x: x["scheduledDepartureTime"], reverse=True)
 
-    # Filter out items where "bookings" == "capacity"
-    filtered_items = [
-        item
-        for item in items
-        if item["bookingOptions"]["bookings"] != item["bookingOptions"]["capacity"]
-    ]
+def _buses_with_seats(departures):
+    # Filter out departures where bookings == capacity
+    filtered_items = [bus for bus in departures if bus.bookings != bus.capacity]
 
     if len(filtered_items) == 0:
         log.error("🚩 there are buses on this route but none with any space remain")
         raise Exception()
 
-    # Convert back "scheduledDepartureTime" to ISO format
-    for item in filtered_items:
-        item["scheduledDepartureTime"] = item["scheduledDepartureTime"].isoformat()
-
     log.info(
-        f"🚍 Found {len(filtered_items)} buses with available seats on this route at: {list(map(lambda x: x['scheduledDepartureTime'], filtered_items))}"
+        f"🚍 Found {len(filtered_items)} buses with available seats on this route at: {[bus.isoformat() for bus in filtered_items]}"
     )
     return filtered_items
 
 
-def get_booking_tickets(LINE_ID, COOKIE):
+def _keep_seat_history(departures):
+    """
+    Record every polled departure, full buses included, for the seat-release
+    analysis. A failure to write is logged and does not stop the poll.
+    """
+    try:
+        record_seat_history(departures)
+    except OSError as e:
+        log.warning(f"⚠️ Failed to record seat history: {e}")
+
+
+def get_available_buses(TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE):
+    response = _send(
+        *_available_buses_request(
+            TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+        )
+    )
+    departures = _parse_available_buses(response, PICKUP_ATCOCODE, DROPOFF_ATCOCODE)
+    _keep_seat_history(departures)
+    return _buses_with_seats(departures)
+
+
+async def get_available_buses_async(
+    TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+):
+    response = await _send_async(
+        *_available_buses_request(
+            TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+        )
+    )
+    departures = _parse_available_buses(response, PICKUP_ATCOCODE, DROPOFF_ATCOCODE)
+    await asyncio.to_thread(_keep_seat_history, departures)
+    return _buses_with_seats(departures)
+
+
+def _booking_tickets_request(LINE_ID, COOKIE):
     url = "https://wellcomegenomecampus.bushub.co.uk/booking/tickets"
 
     headers = {
@@ -324,8 +955,11 @@ def get_booking_tickets(LINE_ID, COOKIE):
         "objects": [{"lineId": LINE_ID, "passengers": 1, "tickets": [], "fares": []}]
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(data_raw))
-    if not response.ok:
+    return "POST", url, {"headers": headers, "data": json.dumps(data_raw)}
+
+
+def _parse_booking_tickets(response):
+    if not _response_ok(response):
         log.error(
             "🚩 Something went wrong with request to fetch current ticket  for this account"
         )
@@ -344,7 +978,16 @@ def get_booking_tickets(LINE_ID, COOKIE):
     return ticket_id
 
 
-def get_existing_reservations(COOKIE):
+def get_booking_tickets(LINE_ID, COOKIE):
+    return _parse_booking_tickets(_send(*_booking_tickets_request(LINE_ID, COOKIE)))
+
+
+async def get_booking_tickets_async(LINE_ID, COOKIE):
+    response = await _send_async(*_booking_tickets_request(LINE_ID, COOKIE))
+    return _parse_booking_tickets(response)
+
+
+def _existing_reservations_request(COOKIE):
     url = "https://wellcomegenomecampus.bushub.co.uk/bookings?take=100"
 
     headers = {
@@ -355,8 +998,11 @@ def get_existing_reservations(COOKIE):
         "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
     }
 
-    response = requests.get(url, headers=headers)
-    if not response.ok:
+    return "GET", url, {"headers": headers}
+
+
+def _parse_existing_reservations(response):
+    if not _response_ok(response):
         log.error(
             f"🚩 Something went wrong with request to get existing bus reservations."
         )
@@ -373,7 +1019,7 @@ def get_existing_reservations(COOKIE):
         )
         raise Exception()
 
-    # Initialize an empty list to store dictionaries representing each row
+    # Initialize an empty list to store a Reservation record for each row
     table_data = []
 
     # Extract rows from the table
@@ -384,6 +1030,9 @@ def get_existing_reservations(COOKIE):
     column_names = [header.text.strip() for header in header_row.find_all("th")]
 
     # Process each row (skip the header row)
+    # the header tuple is shared by every row to avoid repeating it per record
+    columns = tuple(column_names)
+    kept_columns = tuple(name for name in columns if name != "")
     for row in rows[1:]:
         # Get the data cells from the current row
         cells = row.find_all("td")
@@ -391,35 +1040,44 @@ def get_existing_reservations(COOKIE):
         # Create a dictionary for the current row
         row_data = {}
         for i, cell in enumerate(cells):
-            row_data[column_names[i]] = cell.text.strip()
-
-        # Convert 'Date' and 'Time' to datetime object and add 'datetimeISO'
-        date_time_str = row_data["Date"] + " " + row_data["Time"]
-        row_data["datetimeISO"] = datetime.strptime(
-            date_time_str, "%d/%m/%Y %H:%M"
-        ).isoformat()
+            row_data[columns[i]] = cell.text.strip()
 
-        # Extract the date part from 'datetimeISO'
-        row_data["dateISO"] = datetime.strptime(
-            row_data["datetimeISO"], "%Y-%m-%dT%H:%M:%S"
-        ).date()
+        # Convert 'Date' and 'Time' to epoch seconds
+        departure = datetime.strptime(
+            row_data["Date"] + " " + row_data["Time"], "%d/%m/%Y %H:%M"
+        )
 
         # pull out the cancellation ID
+        cancel_id = None
         cancel_form = row.find("form", action=re.compile(r"/booking/cancel/\d+"))
         if cancel_form:
-            action = cancel_form["action"]
-            m = re.search(r"/booking/cancel/(\d+)", action)
-            row_data["cancel_id"] = m.group(1) if m else None
-        else:
-            row_data["cancel_id"] = None
-
-        # Append the row data dictionary to the table_data list
-        table_data.append(row_data)
+            m = re.search(r"/booking/cancel/(\d+)", cancel_form["action"])
+            cancel_id = m.group(1) if m else None
+
+        # Append the compact record to the table_data list
+        table_data.append(
+            Reservation(
+                int(departure.timestamp()),
+                row_data.get("", ""),
+                cancel_id,
+                kept_columns,
+                tuple(sys.intern(row_data.get(name, "")) for name in kept_columns),
+            )
+        )
 
     return table_data
 
 
-def reserve_bus(
+def get_existing_reservations(COOKIE):
+    return _parse_existing_reservations(_send(*_existing_reservations_request(COOKIE)))
+
+
+async def get_existing_reservations_async(COOKIE):
+    response = await _send_async(*_existing_reservations_request(COOKIE))
+    return _parse_existing_reservations(response)
+
+
+def _reserve_bus_request(
     TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE, ticket_id
 ):
     url = "https://wellcomegenomecampus.bushub.co.uk/booking"
@@ -447,24 +1105,88 @@ def reserve_bus(
         ]
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(data_raw))
-    if not response.ok:
+    return "POST", url, {"headers": headers, "data": json.dumps(data_raw)}
+
+
+# replies to a reservation that mean the service can't be booked at this time
+SERVICE_NOT_FOUND = "This service cannot be found at this time."
+BOOKING_BREAK_MESSAGES = [
+    SERVICE_NOT_FOUND,
+    "Future bookings are limited on this service.",
+]
+
+
+def _reserve_error_text(response):
+    return response.text.strip('"').strip("'").strip()
+
+
+def _service_not_running(response, TRAVEL_DATE):
+    """
+    True if BusHub rejected the reservation because the service does not run
+    on that date. A bus that has already left gives the same reply, so it is not counted.
+    """
+    if _response_ok(response) or not _reserve_error_text(response).startswith(
+        SERVICE_NOT_FOUND
+    ):
+        return False
+    departure = datetime.fromisoformat(TRAVEL_DATE)
+    return departure > datetime.now(departure.tzinfo)
+
+
+def _learn_service_closure(response, TRAVEL_DATE, LINE_ID):
+    """Skip the service on this date in later polls if BusHub says it doesn't run."""
+    if _service_not_running(response, TRAVEL_DATE):
+        record_service_closure(TRAVEL_DATE[:10], LINE_ID)
+
+
+def _parse_reserve_response(
+    response, TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+):
+    """
+    Returns the response when the reservation was made, None when the
+    service can't be booked at this time, and raises on any other error.
+    """
+    if not _response_ok(response):
         log.error(
             f"🚩 Something went wrong with request to reserve bus on route: {LINE_ID}, on {TRAVEL_DATE} between stops: {PICKUP_ATCOCODE} and {DROPOFF_ATCOCODE}."
         )
         log.error(response.text)
-        break_error_msgs = [
-            "This service cannot be found at this time.",
-            "Future bookings are limited on this service.",
-        ]
-        response_text = response.text.strip('"').strip("'").strip()
-        if any([response_text.startswith(msg) for msg in break_error_msgs]):
+        response_text = _reserve_error_text(response)
+        if any([response_text.startswith(msg) for msg in BOOKING_BREAK_MESSAGES]):
             return None
         else:
             raise Exception(response.raise_for_status())
     return response
 
 
+def reserve_bus(
+    TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE, ticket_id
+):
+    response = _send(
+        *_reserve_bus_request(
+            TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE, ticket_id
+        )
+    )
+    _learn_service_closure(response, TRAVEL_DATE, LINE_ID)
+    return _parse_reserve_response(
+        response, TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+    )
+
+
+async def reserve_bus_async(
+    TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE, ticket_id
+):
+    response = await _send_async(
+        *_reserve_bus_request(
+            TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE, ticket_id
+        )
+    )
+    await asyncio.to_thread(_learn_service_closure, response, TRAVEL_DATE, LINE_ID)
+    return _parse_reserve_response(
+        response, TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+    )
+
+
 # Function to find the correct route and stop codes based on labels
 def find_route_and_stop_code(period, pickup_label, dropoff_label, busroutes):
     for route_code, route_data in busroutes.items():
@@ -487,6 +1209,11 @@ def get_today_pm_route_info(config, busroutes):
     today = datetime.now()
     day_name = today.strftime("%A")  # Get day name like Monday, Tuesday, etc.
 
+    # Skip bank holidays and closures
+    if today.date().isoformat() in load_closed_dates():
+        log.info(f"⛔ No buses run today ({today.date().isoformat()}).")
+        return None, None, None
+
     # Skip if day not in config
     if day_name not in config["days"]:
         log.info(f"⛔ No configuration for {day_name}.")
@@ -519,173 +1246,293 @@ def get_today_pm_route_info(config, busroutes):
         log.error("🚩 could not identify bus route from these stops")
         return None, None, None
 
+    # Skip a service BusHub recently reported as not running today
+    if is_service_closed(today.date().isoformat(), LINE_ID):
+        log.info(f"⛔ Service {LINE_ID} does not run today ({today.date().isoformat()}).")
+        return None, None, None
+
     return LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
 
 
-def monitor_and_book_pm_bus(config, busroutes, COOKIE, check_interval=30):
+def find_earlier_pm_buses(available_buses, existing_reservations):
     """
-    Continuously monitor for PM bus availability and book as soon as it becomes available.
+    Buses leaving before the active PM reservation of their day, earliest first.
     """
-    log.info("🏠 Starting home-soon mode - monitoring for PM bus availability...")
-
-    while True:
-        try:
-            # Get today's PM route info
-            LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = get_today_pm_route_info(
-                config, busroutes
+    # keyed by date ordinal, valued by the earliest PM departure epoch seconds
+    existing_reserved_evenings = {}
+    for item in existing_reservations:
+        if not item.cancelled and item.is_pm:
+            existing_reserved_evenings[item.day] = min(
+                existing_reserved_evenings.get(item.day, item.departure),
+                item.departure,
             )
 
-            if not LINE_ID:
-                log.info("⛔ No PM route configured for today. Waiting...")
-                time.sleep(check_interval)
-                continue
+    earlier_buses = []
+    for bus in available_buses:
+        reserved_departure = existing_reserved_evenings.get(bus.day)
+        if reserved_departure is not None and bus.departure < reserved_departure:
+            earlier_buses.append(bus)
 
-            today = datetime.now()
-            today_str = today.strftime("%Y-%m-%d")
+    # sort earlier_buses by scheduledDepartureTime
+    earlier_buses.sort(key=lambda x: x.departure)
+    return earlier_buses
 
-            # Check if we already have a PM reservation for today
-            existing_reservations = get_existing_reservations(COOKIE)
-            existing_reserved_evenings = {}
-            for item in existing_reservations:
-                if item[""] != "Cancelled":
-                    if (
-                        datetime.strptime(item["datetimeISO"], "%Y-%m-%dT%H:%M:%S").hour
-                        >= 12
-                    ):
-                        date_key = item["dateISO"].strftime("%Y-%m-%d")
-                        existing_reserved_evenings[date_key] = item["datetimeISO"]
 
-            # Check for available buses
-            try:
-                available_buses = get_available_buses(
-                    today_str, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
-                )
+def split_slot_reservations(existing_reservations, day, period, keep_departure):
+    """
+    Pick the reservation to keep for a (date ordinal, period) slot: the one
+    leaving at keep_departure, or the earliest active one if that booking is
+    not listed. Returns (kept Reservation or None, surplus Reservations).
+    """
+    slot_reservations = [
+        item
+        for item in existing_reservations
+        if not item.cancelled
+        and item.day == day
+        and ("PM" if item.is_pm else "AM") == period
+    ]
+    if not slot_reservations:
+        return None, []
+
+    slot_reservations.sort(key=lambda x: (x.departure != keep_departure, x.departure))
+    keep = slot_reservations[0]
+    if keep.departure != keep_departure:
+        log.warning(
+            f"⚠️ Booking at {datetime.fromtimestamp(keep_departure).isoformat()} not listed, keeping {keep}"
+        )
+    return keep, slot_reservations[1:]
 
-                if not available_buses:
-                    log.info(
-                        "⛔ No PM buses available yet. Checking again in {} seconds...".format(
-                            check_interval
-                        )
-                    )
-                    time.sleep(check_interval)
-                    continue
 
-                # Check if there are any buses that are earlier than our existing reservations
-                earlier_buses = []
-                for bus in available_buses:
-                    bus_datetime = bus["scheduledDepartureTime"]
-                    bus_date = datetime.fromisoformat(bus_datetime).strftime("%Y-%m-%d")
-                    bus_time = datetime.fromisoformat(bus_datetime)
-                    if (
-                        bus_date in existing_reserved_evenings
-                        and bus_time
-                        < datetime.fromisoformat(existing_reserved_evenings[bus_date])
-                    ):
-                        earlier_buses.append(bus)
-
-                # if no earlier buses yet, then skip to next iteration of while loop
-                if not earlier_buses:
-                    log.info(
-                        "⏳ Already on earliest available bus. Checking again in {} seconds...".format(
-                            check_interval
-                        )
-                    )
-                    time.sleep(check_interval)
-                    continue
+async def keep_single_booking_async(COOKIE, day, period, keep_departure):
+    """
+    Make sure only one active reservation survives for a (date ordinal, period)
+    slot, see split_slot_reservations. Every other reservation in the slot is
+    cancelled, all at once.
+    Returns the kept Reservation, or None if the slot holds no reservation.
+    """
+    keep, surplus = split_slot_reservations(
+        await get_existing_reservations_async(COOKIE), day, period, keep_departure
+    )
+    for item in surplus:
+        if not item.cancel_id:
+            log.error(f"🚩 No cancel ID for surplus reservation {item}")
+    to_cancel = [item for item in surplus if item.cancel_id]
+    results = await asyncio.gather(
+        *[cancel_reservation_async(item.cancel_id, COOKIE) for item in to_cancel],
+        return_exceptions=True,
+    )
+    # a failed cancel leaves a spare booking, the kept one still stands
+    for item, result in zip(to_cancel, _raise_interrupts(results)):
+        if isinstance(result, Exception):
+            log.error(f"🚩 Failed to cancel surplus reservation {item}: {result}")
+    return keep
 
-                # sort earlier_buses by scheduledDepartureTime
-                earlier_buses.sort(key=lambda x: x["scheduledDepartureTime"])
-
-                # if we have earlier buses, then book the latest one
-                for bus in earlier_buses:
-                    bus_time = bus["scheduledDepartureTime"]
-                    bus_line = bus["lineId"]
-
-                    # get PM reservation for today
-                    today_existing_reservations = [
-                        reservation
-                        for reservation in existing_reservations
-                        if reservation["dateISO"].strftime("%Y-%m-%d") == today_str
-                    ]
-                    today_existing_reservations.sort(
-                        key=lambda x: x["datetimeISO"], reverse=True
-                    )
 
-                    # Get ticket ID
-                    ticket_id = get_booking_tickets(bus_line, COOKIE)
-
-                    # cancel existing reservation if it exists
-                    reservation_to_cancel = today_existing_reservations[0]["cancel_id"]
-                    if reservation_to_cancel:
-                        cancel_reservation(reservation_to_cancel, COOKIE)
-
-                    # Attempt to reserve bus ticket
-                    reserved = reserve_bus(
-                        bus_time,
-                        bus_line,
-                        PICKUP_ATCOCODE,
-                        DROPOFF_ATCOCODE,
-                        COOKIE,
-                        ticket_id,
-                    )
+async def book_speculatively_async(
+    candidates, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, COOKIE
+):
+    """
+    Fire reservations for all candidate buses at once and keep the earliest
+    one that succeeds. The existing and surplus bookings of the slot are
+    cancelled afterwards, so exactly one booking per slot survives.
+    Returns the kept Departure, or None if no reservation succeeded.
+    """
+    # one ticket lookup per line rather than one per bus
+    lines = list(dict.fromkeys(bus.line_id for bus in candidates))
+    tickets = dict(
+        zip(
+            lines,
+            await asyncio.gather(
+                *[get_booking_tickets_async(line, COOKIE) for line in lines]
+            ),
+        )
+    )
 
-                    if reserved and reserved.ok:
-                        log.info(f"✅ Successfully booked PM bus for {bus_time}!")
-                        return True
-                    elif reserved is None:
-                        log.info(
-                            "⚠️ This bus service cannot be booked at this time, trying next..."
-                        )
-                        continue
-                    else:
-                        log.error("🚩 Failed to book this bus, trying next...")
-                        continue
+    if len(candidates) > 1:
+        log.info(f"🎯 Trying {len(candidates)} buses at once: {candidates}")
+    results = await asyncio.gather(
+        *[
+            reserve_bus_async(
+                bus.isoformat(),
+                bus.line_id,
+                PICKUP_ATCOCODE,
+                DROPOFF_ATCOCODE,
+                COOKIE,
+                tickets[bus.line_id],
+            )
+            for bus in candidates
+        ],
+        return_exceptions=True,
+    )
 
-                    log.error("🚩 Failed to book any of the available buses")
+    succeeded = []
+    for bus, result in zip(candidates, _raise_interrupts(results)):
+        if isinstance(result, Exception):
+            log.info(f"⚠️ Could not book {bus.isoformat()}: {result}")
+        elif result is not None:
+            succeeded.append(bus)
+    if not succeeded:
+        return None
 
+    best = min(succeeded, key=lambda x: x.departure)
+    period = "PM" if best.as_datetime().hour >= 12 else "AM"
+    await keep_single_booking_async(COOKIE, best.day, period, best.departure)
+    return best
+
+
+def monitor_and_book_pm_bus(
+    config, busroutes, COOKIE, check_interval=30, speculative_k=1
+):
+    """
+    Continuously monitor for PM bus availability and book as soon as it becomes available.
+    Blocking entry point of monitor_and_book_pm_bus_async.
+    """
+    return run_on_event_loop(
+        monitor_and_book_pm_bus_async,
+        config,
+        busroutes,
+        COOKIE,
+        check_interval,
+        speculative_k,
+    )
+
+
+async def monitor_and_book_pm_bus_async(
+    config, busroutes, COOKIE, check_interval=30, speculative_k=1, stop=None
+):
+    """
+    Continuously monitor for PM bus availability and book as soon as it becomes available.
+    Earlier buses are reserved speculative_k at a time, earliest first, and
+    today's later booking is only cancelled once an earlier one is held.
+    Waits between checks are cancellable, so setting `stop` ends the
+    monitoring straight away.
+    """
+    log.info("🏠 Starting home-soon mode - monitoring for PM bus availability...")
+
+    while not (stop and stop.is_set()):
+        try:
+            # Get today's PM route info
+            LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = get_today_pm_route_info(
+                config, busroutes
+            )
+            if not LINE_ID:
+                log.info("⛔ No PM route configured for today. Waiting...")
+                await wait_or_stop(check_interval, stop)
+                continue
+
+            today = datetime.now()
+
+            # Check if we already have a PM reservation for today
+            existing_reservations = await get_existing_reservations_async(COOKIE)
+
+            # Check for available buses
+            try:
+                available_buses = await get_available_buses_async(
+                    today.strftime("%Y-%m-%d"),
+                    LINE_ID,
+                    PICKUP_ATCOCODE,
+                    DROPOFF_ATCOCODE,
+                )
             except Exception as e:
                 log.info(
                     f"⏳ No PM buses available yet (or error occurred). Checking again in {check_interval} seconds... Error: {e}"
                 )
+                await wait_or_stop(check_interval, stop)
+                continue
 
-            time.sleep(check_interval)
+            # Check if there are any buses that are earlier than our existing reservations
+            earlier_buses = find_earlier_pm_buses(
+                available_buses, existing_reservations
+            )
+            if not earlier_buses:
+                log.info(
+                    f"⏳ Already on earliest available bus. Checking again in {check_interval} seconds..."
+                )
+                await wait_or_stop(check_interval, stop)
+                continue
+
+            # try the earlier buses in batches and keep the best one booked
+            batch = max(speculative_k, 1)
+            for i in range(0, len(earlier_buses), batch):
+                booked = await book_speculatively_async(
+                    earlier_buses[i : i + batch],
+                    PICKUP_ATCOCODE,
+                    DROPOFF_ATCOCODE,
+                    COOKIE,
+                )
+                if booked:
+                    log.info(f"✅ Successfully booked PM bus for {booked.isoformat()}!")
+                    return True
+
+            log.error("🚩 Failed to book any of the available buses")
 
-        except KeyboardInterrupt:
-            log.info("🛑 Home-soon monitoring stopped by user.")
-            break
         except Exception as e:
             log.error(f"🚩 Error in home-soon monitoring: {e}")
             log.info(f"Retrying in {check_interval} seconds...")
-            time.sleep(check_interval)
 
+        await wait_or_stop(check_interval, stop)
+
+    log.info("🛑 Home-soon monitoring stopped.")
     return False
 
 
-def book_next_two_weeks(config, busroutes, COOKIE):
+def _minute_of_day(hhmm):
+    hours, minutes = str(hhmm).split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def get_period_preferences(period_config):
     """
-    Book buses for the next two weeks (original functionality).
+    Read the optional booking preferences of a day/period in config.yaml:
+    window: ["HH:MM", "HH:MM"] target departure window
+    prefer: latest (default) or earliest bus within the window
     """
-    log.info("📅 Starting two-week booking mode...")
+    window = period_config.get("window")
+    if window:
+        window = (_minute_of_day(window[0]), _minute_of_day(window[1]))
+    prefer = period_config.get("prefer", "latest")
+    if prefer not in ("latest", "earliest"):
+        raise Exception(f"prefer must be 'latest' or 'earliest', not {prefer!r}")
+    return {"window": window, "prefer": prefer}
 
-    # get details of existing bus reservations
-    existing_reservations = get_existing_reservations(COOKIE)
-    # convert time of reservations to string format for comparing with available reservations
-    # split into two lists one for morning and one for evening so we can check if we
-    # have already booked a bus for that part of day
-    existing_reserved_mornings = []
-    existing_reserved_evenings = []
-    for item in existing_reservations:
-        if item[""] != "Cancelled":
-            # if the datetime is before noon
-            if datetime.strptime(item["datetimeISO"], "%Y-%m-%dT%H:%M:%S").hour < 12:
-                existing_reserved_mornings.append(item["dateISO"].strftime("%Y-%m-%d"))
-            else:
-                existing_reserved_evenings.append(item["dateISO"].strftime("%Y-%m-%d"))
 
-    # get string format of every date in next week (bar weekends)
-    next_dates = get_upcoming_dates(start_date=None)
+def rank_candidates(departures, preferences, fallback=False):
+    """
+    Order departures from best to worst for the given preferences.
+    Buses inside the target window come first (latest or earliest first),
+    then the others by how far they are from the window. Buses on the
+    fallback route rank after every bus on the main route.
+    Returns a list of (score, Departure) tuples, lowest score first.
+    """
+    window = preferences["window"]
+    direction = 1 if preferences["prefer"] == "earliest" else -1
+
+    ranked = []
+    for bus in departures:
+        departure = bus.as_datetime()
+        minute = departure.hour * 60 + departure.minute
+        distance = 0
+        if window:
+            distance = max(window[0] - minute, minute - window[1], 0)
+        ranked.append(((fallback, distance, direction * bus.departure), bus))
+    ranked.sort(key=lambda x: x[0])
+    return ranked
+
+
+def plan_two_week_slots(config, busroutes, existing_reservations):
+    """
+    List every (date, period) slot in the next two weeks that still needs a
+    booking, with the routes to query (main route first, then the optional
+    fallback route) and the booking preferences of that slot.
+    """
+    # date ordinals with an active booking, per period
+    booked = {"AM": set(), "PM": set()}
+    for item in existing_reservations:
+        if not item.cancelled:
+            booked["PM" if item.is_pm else "AM"].add(item.day)
 
-    for TRAVEL_DATE in next_dates:
+    slots = []
+    for TRAVEL_DATE in get_upcoming_dates(start_date=None):
         dateISO = datetime.strptime(TRAVEL_DATE, "%Y-%m-%d").date()
         day_name = dateISO.strftime("%A")  # Get day name like Monday, Tuesday, etc.
 
@@ -695,76 +1542,231 @@ def book_next_two_weeks(config, busroutes, COOKIE):
             continue
 
         for period in ["AM", "PM"]:
-            LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = None, None, None
-            bus_service = None
-
-            if period in config["days"][day_name]:
-                pickup_label = config["days"][day_name][period].get("pickup")
-                dropoff_label = config["days"][day_name][period].get("dropoff")
-
-                if pickup_label and dropoff_label:
-                    # Find the service and stop codes from busroutes.yaml
-                    LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = (
-                        find_route_and_stop_code(
-                            period, pickup_label, dropoff_label, busroutes
-                        )
-                    )
+            period_config = config["days"][day_name].get(period) or {}
+
+            routes = []
+            for route_config, fallback in [
+                (period_config, False),
+                (period_config.get("fallback") or {}, True),
+            ]:
+                pickup_label = route_config.get("pickup")
+                dropoff_label = route_config.get("dropoff")
+                if not pickup_label or not dropoff_label:
+                    continue
+                # Find the service and stop codes from busroutes.yaml
+                LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = find_route_and_stop_code(
+                    period, pickup_label, dropoff_label, busroutes
+                )
+                if not (LINE_ID and PICKUP_ATCOCODE and DROPOFF_ATCOCODE):
+                    continue
+                if is_service_closed(TRAVEL_DATE, LINE_ID):
+                    log.info(f"⛔ Service {LINE_ID} does not run on {TRAVEL_DATE}.")
+                    continue
+                routes.append((LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, fallback))
 
             # If either pickup or dropoff codes are missing, skip this period
-            if PICKUP_ATCOCODE is None or DROPOFF_ATCOCODE is None:
+            if not routes:
                 log.info(
                     f"⛔ No valid configuration for {day_name} {period}. Check spelling on stop names. Skipping..."
                 )
                 continue
 
-            if not LINE_ID:
-                log.error("🚩 could not identify bus route from these stops")
-                raise Exception()
-
-            existing_reservations_period = (
-                existing_reserved_mornings
-                if period == "AM"
-                else existing_reserved_evenings
-            )
-            if TRAVEL_DATE in existing_reservations_period:
-                log.info(f"🚌 Bus already booked for {TRAVEL_DATE}.")
+            if dateISO.toordinal() in booked[period]:
+                log.info(f"🚌 Bus already booked for {TRAVEL_DATE} {period}.")
                 continue
 
-            # get list of buses with available seats on the desired date
-            available_buses = get_available_buses(
-                TRAVEL_DATE, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+            slots.append(
+                {
+                    "date": TRAVEL_DATE,
+                    "period": period,
+                    "routes": routes,
+                    "preferences": get_period_preferences(period_config),
+                }
             )
+    return slots
+
+
+async def take_availability_snapshot_async(slots, max_concurrency=4):
+    """
+    Query availability for every route of every slot concurrently, with at
+    most max_concurrency queries in flight.
+    Returns {(date, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE): [Departure]},
+    with an empty list where no bus has a free seat.
+    """
+    queries = []
+    for slot in slots:
+        for LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, _ in slot["routes"]:
+            query = (slot["date"], LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE)
+            if query not in queries:
+                queries.append(query)
+
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def query_buses(query):
+        async with limit:
+            return await get_available_buses_async(*query)
 
-            # attempt booking bus ticket in order of latest departure time
-            for item in available_buses:
-                # get bus departure time and id of bus route (line id)
-                bus_time = item["scheduledDepartureTime"]
-                bus_line = item["lineId"]
+    results = await asyncio.gather(
+        *[query_buses(query) for query in queries], return_exceptions=True
+    )
+
+    snapshot = {}
+    for query, result in zip(queries, _raise_interrupts(results)):
+        if isinstance(result, Exception):
+            log.info(f"⛔ No bookable buses for {query}: {result}")
+            result = []
+        snapshot[query] = result
+    return snapshot
+
+
+def save_snapshot(slots, snapshot, filename):
+    """
+    Save the planned slots and their availability snapshot as JSON, so the
+    booking plan can be replayed later with the replay mode.
+    """
+    with open(filename, "w") as file:
+        json.dump(
+            {
+                "slots": slots,
+                "availability": [
+                    {"query": list(query), "items": [bus.to_dict() for bus in buses]}
+                    for query, buses in snapshot.items()
+                ],
+            },
+            file,
+            indent=2,
+        )
 
-                # get id of currently owned ticket
-                ticket_id = get_booking_tickets(bus_line, COOKIE)
 
-                # attempt to reserve bus ticket
-                # on error (e.g. bus is full), try next bus
-                reserved = reserve_bus(
-                    bus_time,
-                    bus_line,
+def load_snapshot(filename):
+    """
+    Load the slots and availability snapshot saved by save_snapshot.
+    Returns (slots, snapshot) in the shapes used by book_next_two_weeks.
+    """
+    with open(filename) as file:
+        saved = json.load(file)
+    slots = saved["slots"]
+    for slot in slots:
+        slot["routes"] = [tuple(route) for route in slot["routes"]]
+    snapshot = {
+        tuple(entry["query"]): [Departure.from_dict(item) for item in entry["items"]]
+        for entry in saved["availability"]
+    }
+    return slots, snapshot
+
+
+def rank_slot_candidates(slot, snapshot):
+    """
+    Ranked (Departure, PICKUP_ATCOCODE, DROPOFF_ATCOCODE) candidates of a slot.
+    """
+    ranked = []
+    for LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE, fallback in slot["routes"]:
+        departures = snapshot.get(
+            (slot["date"], LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE), []
+        )
+        for score, bus in rank_candidates(departures, slot["preferences"], fallback):
+            ranked.append((score, bus, PICKUP_ATCOCODE, DROPOFF_ATCOCODE))
+    ranked.sort(key=lambda x: x[0])
+    return [(bus, pickup, dropoff) for _, bus, pickup, dropoff in ranked]
+
+
+def book_next_two_weeks(
+    config, busroutes, COOKIE, max_concurrency=4, snapshot_file=None
+):
+    """
+    Book buses for the next two weeks.
+    Blocking entry point of book_next_two_weeks_async.
+    """
+    return run_on_event_loop(
+        book_next_two_weeks_async,
+        config,
+        busroutes,
+        COOKIE,
+        max_concurrency,
+        snapshot_file,
+    )
+
+
+async def book_next_two_weeks_async(
+    config, busroutes, COOKIE, max_concurrency=4, snapshot_file=None
+):
+    """
+    Book buses for the next two weeks.
+    Availability for every slot is read in one concurrent snapshot, the
+    buses of each slot are ranked by the preferences in config.yaml, and
+    reservations are sent in ranked order until one succeeds.
+    """
+    log.info("📅 Starting two-week booking mode...")
+
+    # get details of existing bus reservations
+    existing_reservations = await get_existing_reservations_async(COOKIE)
+    slots = plan_two_week_slots(config, busroutes, existing_reservations)
+    if not slots:
+        return
+
+    snapshot = await take_availability_snapshot_async(slots, max_concurrency)
+    if snapshot_file:
+        await asyncio.to_thread(save_snapshot, slots, snapshot, snapshot_file)
+
+    # ticket ids per line, dropped after every reservation attempt that
+    # used them so the next one is fetched with up to date activations
+    tickets = {}
+    for slot in slots:
+        for bus, PICKUP_ATCOCODE, DROPOFF_ATCOCODE in rank_slot_candidates(
+            slot, snapshot
+        ):
+            # an earlier reservation may have revealed that this service doesn't run
+            if is_service_closed(slot["date"], bus.line_id):
+                log.info(f"⛔ Service {bus.line_id} does not run on {slot['date']}.")
+                continue
+
+            # attempt to reserve bus ticket
+            # on error (e.g. bus filled up since the snapshot), try next bus
+            try:
+                if bus.line_id not in tickets:
+                    tickets[bus.line_id] = await get_booking_tickets_async(
+                        bus.line_id, COOKIE
+                    )
+                reserved = await reserve_bus_async(
+                    bus.isoformat(),
+                    bus.line_id,
                     PICKUP_ATCOCODE,
                     DROPOFF_ATCOCODE,
                     COOKIE,
-                    ticket_id,
+                    tickets[bus.line_id],
                 )
-                if reserved:
-                    if reserved.ok:
-                        break  # break to not book multiple buses for same day
-                else:
-                    break
+            except Exception as e:
+                log.info(f"⚠️ Could not book {bus.isoformat()}, trying next: {e}")
+                tickets.pop(bus.line_id, None)
+                continue
 
+            # stop on success (to not book multiple buses for the same slot)
+            # or when the service can't be booked at this time
+            if reserved is not None:
+                # the booking used up an activation of the ticket
+                tickets.pop(bus.line_id, None)
+            break
 
-def cancel_reservation(cancel_id, COOKIE):
+
+def replay_snapshot(filename):
     """
-    Cancel a bus reservation using the provided cancel_id.
+    Dry run of book_next_two_weeks against a saved snapshot: print the buses
+    of each slot in the order they would be reserved, without sending any request.
     """
+    slots, snapshot = load_snapshot(filename)
+    for slot in slots:
+        candidates = rank_slot_candidates(slot, snapshot)
+        if not candidates:
+            print(f"{slot['date']} {slot['period']}: no bus with a free seat")
+            continue
+        ranked = ", ".join(
+            f"{bus.as_datetime():%H:%M} ({bus.line_id}, {bus.seats_left} left)"
+            for bus, _, _ in candidates
+        )
+        print(f"{slot['date']} {slot['period']}: {ranked}")
+
+
+def _cancel_reservation_request(cancel_id, COOKIE):
     url = f"https://wellcomegenomecampus.bushub.co.uk/booking/cancel/{cancel_id}"
 
     headers = {
@@ -778,8 +1780,11 @@ def cancel_reservation(cancel_id, COOKIE):
         "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
     }
 
-    response = requests.post(url, headers=headers)
-    if not response.ok:
+    return "POST", url, {"headers": headers}
+
+
+def _parse_cancel_response(response, cancel_id):
+    if not _response_ok(response):
         log.error(
             f"🚩 Something went wrong with cancelling reservation with ID: {cancel_id}."
         )
@@ -789,6 +1794,466 @@ def cancel_reservation(cancel_id, COOKIE):
     log.info(f"✅ Successfully cancelled reservation with ID {cancel_id}")
 
 
+def cancel_reservation(cancel_id, COOKIE):
+    """
+    Cancel a bus reservation using the provided cancel_id.
+    """
+    response = _send(*_cancel_reservation_request(cancel_id, COOKIE))
+    _parse_cancel_response(response, cancel_id)
+
+
+async def cancel_reservation_async(cancel_id, COOKIE):
+    """
+    Cancel a bus reservation using the provided cancel_id, on the event loop.
+    """
+    response = await _send_async(*_cancel_reservation_request(cancel_id, COOKIE))
+    _parse_cancel_response(response, cancel_id)
+
+
+def cancel_reservations_in_range(
+    COOKIE, from_date, to_date, period=None, max_concurrency=4
+):
+    """
+    Cancel every active reservation between from_date and to_date (inclusive).
+    Blocking entry point of cancel_reservations_in_range_async.
+    """
+    return run_on_event_loop(
+        cancel_reservations_in_range_async,
+        COOKIE,
+        from_date,
+        to_date,
+        period,
+        max_concurrency,
+    )
+
+
+async def cancel_reservations_in_range_async(
+    COOKIE, from_date, to_date, period=None, max_concurrency=4
+):
+    """
+    Cancel every active reservation between from_date and to_date (inclusive),
+    optionally only the AM or PM ones. Cancellations are sent concurrently,
+    with at most max_concurrency in flight, and confirmed with one re-fetch.
+    Returns the list of cancel IDs that could not be cancelled.
+    """
+    to_cancel = reservations_in_range(
+        await get_existing_reservations_async(COOKIE), from_date, to_date, period
+    )
+    if not to_cancel:
+        log.info(f"⛔ No reservations to cancel between {from_date} and {to_date}.")
+        return []
+
+    log.info(f"🗑️ Cancelling {len(to_cancel)} reservations...")
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def cancel(item):
+        async with limit:
+            await cancel_reservation_async(item.cancel_id, COOKIE)
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *[cancel(item) for item in to_cancel], return_exceptions=True
+    )
+    elapsed = time.monotonic() - start
+
+    failed = set()
+    for item, result in zip(to_cancel, _raise_interrupts(results)):
+        if isinstance(result, Exception):
+            log.error(f"🚩 Failed to cancel {item}: {result}")
+            failed.add(item.cancel_id)
+
+    # confirm the whole set with a single re-fetch
+    return report_cancellations(
+        to_cancel, failed, await get_existing_reservations_async(COOKIE), elapsed
+    )
+
+
+def reservations_in_range(existing_reservations, from_date, to_date, period=None):
+    """
+    Active, cancellable reservations between from_date and to_date (inclusive),
+    optionally only the AM or PM ones.
+    """
+    from_day = datetime.strptime(from_date, "%Y-%m-%d").toordinal()
+    to_day = datetime.strptime(to_date, "%Y-%m-%d").toordinal()
+    return [
+        item
+        for item in existing_reservations
+        if not item.cancelled
+        and item.cancel_id
+        and from_day <= item.day <= to_day
+        and (period is None or ("PM" if item.is_pm else "AM") == period)
+    ]
+
+
+def report_cancellations(to_cancel, failed, refetched_reservations, elapsed):
+    """
+    Log throughput and failures of a bulk cancellation, counting reservations
+    still active in the re-fetched list as failed.
+    Returns the sorted list of cancel IDs that could not be cancelled.
+    """
+    still_active = {
+        item.cancel_id for item in refetched_reservations if not item.cancelled
+    }
+    failed = set(failed)
+    failed |= {item.cancel_id for item in to_cancel if item.cancel_id in still_active}
+
+    cancelled = len(to_cancel) - len(failed)
+    log.info(
+        f"✅ Cancelled {cancelled}/{len(to_cancel)} reservations in {elapsed:.2f}s ({cancelled / elapsed if elapsed else cancelled:.1f}/s)"
+    )
+    if failed:
+        log.error(f"🚩 Reservations still active after cancelling: {sorted(failed)}")
+    return sorted(failed)
+
+
+class WatchSlot:
+    """
+    One (date, period) slot of the booking horizon kept in the watch queue.
+    booked_departure is set when the slot already holds a reservation that
+    could still be improved on (an earlier PM bus).
+    """
+
+    __slots__ = (
+        "day",
+        "period",
+        "line_id",
+        "pickup",
+        "dropoff",
+        "booked_departure",
+    )
+
+    def __init__(self, day, period, line_id, pickup, dropoff):
+        self.day = day
+        self.period = period
+        self.line_id = line_id
+        self.pickup = pickup
+        self.dropoff = dropoff
+        self.booked_departure = None
+
+    @property
+    def travel_date(self):
+        return date.fromordinal(self.day).isoformat()
+
+    def expires_at(self):
+        """Epoch seconds after which this slot no longer needs watching."""
+        if self.booked_departure is not None:
+            return self.booked_departure
+        end = datetime.combine(date.fromordinal(self.day), datetime.min.time())
+        end += timedelta(hours=12) if self.period == "AM" else timedelta(days=1)
+        return int(end.timestamp())
+
+    def __repr__(self):
+        return f"WatchSlot({self.travel_date} {self.period}, booked={self.booked_departure is not None})"
+
+
+def slot_poll_interval(slot, check_interval, max_interval=1800, now=None):
+    """
+    Seconds to wait before polling a slot again. Today's slots are polled
+    every check_interval, and each day further away doubles it, capped at
+    max_interval, so near slots get most of the request budget.
+    """
+    if now is None:
+        now = datetime.now()
+    days_ahead = max(slot.day - now.toordinal(), 0)
+    return min(check_interval * 2 ** min(days_ahead, 10), max(max_interval, check_interval))
+
+
+def get_period_route_info(config, busroutes, day_name, period):
+    """
+    Get the route information for a day name and period of the configuration.
+    Returns (LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE) or (None, None, None) if not found.
+    """
+    period_config = config["days"].get(day_name, {}).get(period)
+    if not period_config:
+        return None, None, None
+
+    pickup_label = period_config.get("pickup")
+    dropoff_label = period_config.get("dropoff")
+    if not pickup_label or not dropoff_label:
+        return None, None, None
+
+    return find_route_and_stop_code(period, pickup_label, dropoff_label, busroutes)
+
+
+def build_watch_slots(config, busroutes, existing_reservations):
+    """
+    Build the slots across the booking horizon that are either unfilled or
+    hold a PM reservation for which an earlier bus may still turn up.
+    """
+    booked = {}
+    for item in existing_reservations:
+        if not item.cancelled:
+            booked[(item.day, "PM" if item.is_pm else "AM")] = item
+
+    slots = []
+    today = datetime.now().date().isoformat()
+    for TRAVEL_DATE in [today] + get_upcoming_dates(start_date=None):
+        dateISO = datetime.strptime(TRAVEL_DATE, "%Y-%m-%d").date()
+        if dateISO.weekday() >= 5 or TRAVEL_DATE in load_closed_dates():
+            continue
+        day_name = dateISO.strftime("%A")
+
+        for period in ["AM", "PM"]:
+            LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE = get_period_route_info(
+                config, busroutes, day_name, period
+            )
+            if not LINE_ID or PICKUP_ATCOCODE is None or DROPOFF_ATCOCODE is None:
+                continue
+            if is_service_closed(TRAVEL_DATE, LINE_ID):
+                continue
+
+            slot = WatchSlot(
+                dateISO.toordinal(), period, LINE_ID, PICKUP_ATCOCODE, DROPOFF_ATCOCODE
+            )
+            reservation = booked.get((slot.day, period))
+            if reservation is not None:
+                # mornings are booked latest-first so only evenings can improve
+                if period == "AM":
+                    continue
+                slot.booked_departure = reservation.departure
+
+            if slot.expires_at() > time.time():
+                slots.append(slot)
+
+    return slots
+
+
+def watch_slot_candidates(slot, available_buses):
+    """
+    Buses to try for a slot: the latest first when it is unfilled, or the
+    earliest first among those leaving before its current reservation.
+    """
+    if slot.booked_departure is None:
+        return available_buses
+    candidates = [
+        bus for bus in available_buses if bus.departure < slot.booked_departure
+    ]
+    candidates.sort(key=lambda x: x.departure)
+    return candidates
+
+
+async def poll_watch_slot_async(slot, COOKIE):
+    """
+    Check availability for a single slot and book it if possible.
+    Unfilled slots take the latest bus with a seat, booked PM slots swap to
+    the earliest bus that leaves before the current reservation. The new bus
+    is reserved first and the old booking only cancelled once it is held, so
+    a failed swap keeps the current reservation.
+    Returns True if a reservation was made for the slot.
+    """
+    available_buses = await get_available_buses_async(
+        slot.travel_date, slot.line_id, slot.pickup, slot.dropoff
+    )
+
+    for bus in watch_slot_candidates(slot, available_buses):
+        try:
+            ticket_id = await get_booking_tickets_async(bus.line_id, COOKIE)
+            reserved = await reserve_bus_async(
+                bus.isoformat(),
+                bus.line_id,
+                slot.pickup,
+                slot.dropoff,
+                COOKIE,
+                ticket_id,
+            )
+        except Exception as e:
+            log.error(f"🚩 Failed to book {bus.isoformat()} for {slot}: {e}")
+            continue
+
+        if reserved is None:
+            # service not bookable yet (e.g. too far ahead), retry on next poll
+            return False
+        log.info(f"✅ Booked {slot.period} bus for {bus.isoformat()}")
+        slot.booked_departure = bus.departure
+        if slot.period == "PM":
+            # the old booking is only dropped now that the new one is held
+            await keep_single_booking_async(COOKIE, slot.day, slot.period, bus.departure)
+        return True
+
+    return False
+
+
+def watch_unfilled_slots(
+    config, busroutes, COOKIE, check_interval=30, max_interval=1800, max_concurrency=4
+):
+    """
+    Watch every unfilled or improvable slot in the booking horizon.
+    Blocking entry point of watch_unfilled_slots_async.
+    """
+    return run_on_event_loop(
+        watch_unfilled_slots_async,
+        config,
+        busroutes,
+        COOKIE,
+        check_interval,
+        max_interval,
+        max_concurrency,
+    )
+
+
+async def watch_unfilled_slots_async(
+    config,
+    busroutes,
+    COOKIE,
+    check_interval=30,
+    max_interval=1800,
+    max_concurrency=4,
+    stop=None,
+):
+    """
+    Watch every unfilled or improvable slot in the booking horizon from a single loop.
+    Slots sit in a heap ordered by their next check time, and slots closer
+    to today are polled more often than those further out. Slots that are
+    due at the same time are polled concurrently (at most max_concurrency at
+    once), and the wait for the next due slot is cancellable through `stop`.
+    """
+    log.info("👀 Starting watch mode - monitoring all unfilled slots...")
+
+    existing_reservations = await get_existing_reservations_async(COOKIE)
+    slots = build_watch_slots(config, busroutes, existing_reservations)
+
+    # entries are (next check epoch, tie breaker, slot)
+    queue = []
+    now = time.time()
+    for counter, slot in enumerate(slots):
+        heapq.heappush(queue, (now, counter, slot))
+    counter = len(slots)
+    log.info(f"👀 Watching {len(queue)} slots: {[slot for _, _, slot in queue]}")
+
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def poll(slot):
+        async with limit:
+            try:
+                booked = await poll_watch_slot_async(slot, COOKIE)
+            except Exception as e:
+                log.info(f"⏳ Nothing bookable for {slot} yet: {e}")
+                return slot, False
+            return slot, booked
+
+    while queue:
+        if await wait_or_stop(queue[0][0] - time.time(), stop):
+            log.info("🛑 Watch mode stopped.")
+            return False
+
+        # pop every slot that is due now
+        due = []
+        while queue and queue[0][0] <= time.time():
+            _, _, slot = heapq.heappop(queue)
+            if slot.expires_at() <= time.time():
+                log.info(f"⌛ {slot} has passed, no longer watching")
+            elif is_service_closed(slot.travel_date, slot.line_id):
+                log.info(f"⛔ No buses run for {slot}, no longer watching")
+            else:
+                due.append(slot)
+
+        for slot, booked in await asyncio.gather(*[poll(slot) for slot in due]):
+            # a freshly filled morning is final, evenings keep looking for earlier buses
+            if booked and slot.period == "AM":
+                continue
+            counter += 1
+            interval = slot_poll_interval(slot, check_interval, max_interval)
+            heapq.heappush(queue, (time.time() + interval, counter, slot))
+
+    log.info("✅ No slots left to watch.")
+    return True
+
+
+def load_seat_history(history_dir=None):
+    """
+    Load the columnar seat history log into a pandas DataFrame.
+    Columns are truncated to the shortest one in case a write was interrupted.
+    """
+    import numpy as np
+    import pandas as pd
+
+    history_dir = history_dir or SEAT_HISTORY_DIR
+    dtypes = {"q": np.int64, "i": np.int32, "h": np.int16}
+    columns = {}
+    for name, typecode in SEAT_HISTORY_COLUMNS:
+        path = os.path.join(history_dir, f"{name}.bin")
+        if not os.path.exists(path):
+            raise Exception(f"No seat history found in {history_dir}")
+        # array typecodes are native sized, numpy dtypes here match them
+        columns[name] = np.fromfile(path, dtype=np.dtype(dtypes[typecode]))
+    rows = min(len(column) for column in columns.values())
+    history = pd.DataFrame({name: column[:rows] for name, column in columns.items()})
+
+    with open(os.path.join(history_dir, "services.txt")) as file:
+        services = [line.rstrip("\n") for line in file]
+    history["service"] = pd.Categorical.from_codes(
+        history["service"], categories=services
+    )
+    return history
+
+
+def analyse_seat_history(
+    history_dir=None,
+    bucket_minutes=30,
+    min_interval=15,
+    max_interval=1800,
+    max_gap=7200,
+):
+    """
+    Compute per-service seat-release rates by time of day from the seat
+    history log, and recommend a poll interval for each time bucket.
+    A release is a drop in bookings between two consecutive polls of the
+    same departure; rates are releases per hour of observed polling.
+    """
+    import numpy as np
+    import pandas as pd
+
+    history = load_seat_history(history_dir)
+    history = history.sort_values(["service", "departure", "poll_time"], kind="stable")
+
+    service = history["service"].cat.codes.to_numpy()
+    departure = history["departure"].to_numpy()
+    poll_time = history["poll_time"].to_numpy()
+    bookings = history["bookings"].to_numpy(dtype=np.int64)
+
+    # consecutive polls of the same departure, ignoring long gaps (e.g. overnight)
+    same = (service[1:] == service[:-1]) & (departure[1:] == departure[:-1])
+    gap = poll_time[1:] - poll_time[:-1]
+    observed = same & (gap <= max_gap)
+    released = np.where(observed, np.clip(bookings[:-1] - bookings[1:], 0, None), 0)
+
+    # bucket by the local (campus) time of day of the later poll
+    poll_local = (
+        pd.to_datetime(poll_time[1:], unit="s", utc=True)
+        .tz_convert("Europe/London")
+    )
+    minute_of_day = poll_local.hour * 60 + poll_local.minute
+    bucket = (minute_of_day // bucket_minutes) * bucket_minutes
+
+    pairs = pd.DataFrame(
+        {
+            "service": history["service"].to_numpy()[1:],
+            "bucket": bucket,
+            "released": released,
+            "observed_hours": np.where(observed, gap, 0) / 3600,
+            "polls": observed.astype(np.int64),
+        }
+    )
+    pairs = pairs[pairs["polls"] > 0]
+    summary = pairs.groupby(["service", "bucket"], observed=True).sum().reset_index()
+    summary["release_rate"] = summary["released"] / summary["observed_hours"].where(
+        summary["observed_hours"] > 0
+    )
+
+    # aim for about four polls per expected release, within the interval bounds
+    summary["poll_interval"] = (
+        (3600 / (4 * summary["release_rate"]))
+        .clip(lower=min_interval, upper=max_interval)
+        .fillna(max_interval)
+        .round()
+        .astype(int)
+    )
+    summary["time"] = [f"{b // 60:02d}:{b % 60:02d}" for b in summary["bucket"]]
+    return summary[
+        ["service", "time", "polls", "released", "release_rate", "poll_interval"]
+    ]
+
+
 def main():
     """
     Main function that handles command line arguments and executes the appropriate mode.
@@ -798,17 +2263,96 @@ def main():
         "mode",
         nargs="?",
         default="continuous",
-        choices=["continuous", "home-soon"],
-        help="Mode to run: continuous (book next 2 weeks) or home-soon (monitor PM bus)",
+        choices=[
+            "continuous",
+            "home-soon",
+            "watch",
+            "cancel",
+            "analyse-history",
+            "replay",
+        ],
+        help="Mode to run: continuous (book next 2 weeks), home-soon (monitor PM bus), watch (monitor every unfilled slot), cancel (cancel reservations in a date range), analyse-history (seat-release rates from recorded polls) or replay (print the booking plan of a saved snapshot)",
     )
     parser.add_argument(
         "--check-interval",
         type=int,
         default=30,
-        help="Check interval in seconds for home-soon mode (default: 30)",
+        help="Check interval in seconds for home-soon and watch modes (default: 30)",
+    )
+    parser.add_argument(
+        "--speculative-k",
+        type=int,
+        default=1,
+        help="In home-soon mode, reserve the earliest K earlier buses at once and keep the best one (default: 1, one at a time)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=int,
+        default=1800,
+        help="Longest interval in seconds between checks of a far away slot in watch mode (default: 1800)",
+    )
+
+    parser.add_argument(
+        "--from",
+        dest="from_date",
+        help="First date (YYYY-MM-DD) of reservations to cancel in cancel mode",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_date",
+        help="Last date (YYYY-MM-DD) of reservations to cancel in cancel mode (default: same as --from)",
+    )
+    parser.add_argument(
+        "--period",
+        choices=["AM", "PM"],
+        help="Only cancel AM or PM reservations in cancel mode (default: both)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of requests sent at once in continuous, watch and cancel modes (default: 4)",
+    )
+    parser.add_argument(
+        "--snapshot-file",
+        help="Save the availability snapshot of continuous mode to this JSON file, or the snapshot to read in replay mode",
+    )
+
+    parser.add_argument(
+        "--bucket-minutes",
+        type=int,
+        default=30,
+        help="Width of the time of day buckets in analyse-history mode (default: 30)",
+    )
+
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="Send requests through the requests library from worker threads instead of the httpx async client",
     )
 
     args = parser.parse_args()
+    if args.mode == "cancel" and not args.from_date:
+        parser.error("cancel mode requires --from DATE")
+    if args.mode == "replay" and not args.snapshot_file:
+        parser.error("replay mode requires --snapshot-file FILE")
+
+    # every mode runs on the event loop, sending requests with httpx when installed
+    use_httpx = not args.blocking
+    if use_httpx and importlib.util.find_spec("httpx") is None:
+        log.info("📝 httpx is not installed, using blocking requests instead")
+        use_httpx = False
+
+    # the analysis only reads the local seat history, no login needed
+    if args.mode == "analyse-history":
+        summary = analyse_seat_history(bucket_minutes=args.bucket_minutes)
+        print(summary.to_string(index=False))
+        return
+
+    # replaying a saved snapshot sends no requests either
+    if args.mode == "replay":
+        replay_snapshot(args.snapshot_file)
+        return
 
     # if login_details file exists, read in username and password
     login_details = "login_details.txt"
@@ -831,6 +2375,21 @@ def main():
         COOKIE = f.read().strip()
         COOKIE = COOKIE.replace("\n", "; ")
 
+    # Cancelling only needs the existing reservations, not the bus routes
+    if args.mode == "cancel":
+        failed = run_on_event_loop(
+            cancel_reservations_in_range_async,
+            COOKIE,
+            args.from_date,
+            args.to_date or args.from_date,
+            args.period,
+            args.max_concurrency,
+            use_httpx=use_httpx,
+        )
+        if failed:
+            raise Exception(f"Failed to cancel reservations: {failed}")
+        return
+
     # Dynamically update busroutes.yaml with latest bus stop information
     log.info("🔄 Fetching latest bus stop information...")
     try:
@@ -867,9 +2426,36 @@ def main():
 
     # Execute the appropriate mode
     if args.mode == "home-soon":
-        monitor_and_book_pm_bus(config, busroutes, COOKIE, args.check_interval)
+        run_on_event_loop(
+            monitor_and_book_pm_bus_async,
+            config,
+            busroutes,
+            COOKIE,
+            args.check_interval,
+            args.speculative_k,
+            use_httpx=use_httpx,
+        )
+    elif args.mode == "watch":
+        run_on_event_loop(
+            watch_unfilled_slots_async,
+            config,
+            busroutes,
+            COOKIE,
+            args.check_interval,
+            args.max_interval,
+            args.max_concurrency,
+            use_httpx=use_httpx,
+        )
     else:  # continuous mode (default)
-        book_next_two_weeks(config, busroutes, COOKIE)
+        run_on_event_loop(
+            book_next_two_weeks_async,
+            config,
+            busroutes,
+            COOKIE,
+            args.max_concurrency,
+            args.snapshot_file,
+            use_httpx=use_httpx,
+        )
 
 
 if __name__ == "__main__":
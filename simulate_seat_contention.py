@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Seat-contention load simulator.
+
+Runs N simulated accounts through book_next_two_weeks and
+monitor_and_book_pm_bus against an in-process fake BusHub with a limited
+number of seats per bus, while outside users keep taking and releasing
+seats on today's PM buses. Reports booking success rate, time to book,
+requests per booking and double-booking / lost-seat incidents for each
+combination of concurrency and poll interval.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import re
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import reserve_bus_seats_bushub as bushub
+
+log = logging.getLogger()
+
+PM_TIMES = ["16:30", "17:00", "17:30", "18:00"]
+AM_TIMES = ["07:30", "08:00", "08:30"]
+LATE_PM_TIME = "19:00"
+TOWN_STOP = "T0"
+CAMPUS_STOP = "C0"
+
+
+class SimulationOver(BaseException):
+    """
+    Raised from the fake BusHub once the run deadline passes. It derives from
+    BaseException so the retry loops in the booking modes don't swallow it.
+    """
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = text if payload is None else json.dumps(payload)
+        self._payload = payload
+
+    def json(self):
+        return self._payload if self._payload is not None else json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise Exception(f"{self.status_code} Error: {self.text}")
+
+
+class FakeBusHub:
+    """
+    Thread-safe in-process stand in for the BusHub endpoints used by the
+    booking modes. Seats are truly limited: a reservation only succeeds if
+    the bus still has a free seat at the moment it is processed.
+    """
+
+    def __init__(self, line_id, capacity, late_capacity, deadline):
+        self.line_id = line_id
+        self.capacity = capacity
+        self.late_capacity = late_capacity
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.booking_ids = itertools.count(1000)
+        # departure ISO string -> set of active booking ids
+        self.departures = {}
+        # booking id -> [account, departure ISO, active]
+        self.bookings = {}
+        # account -> requests sent, availability requests carry no cookie
+        # and are counted under None
+        self.requests = {}
+        self.events = []
+        self.start = time.monotonic()
+
+    # -- helpers -------------------------------------------------------------
+
+    def _departures_on(self, travel_date, period=None):
+        times = []
+        if period in (None, "AM"):
+            times += AM_TIMES
+        if period in (None, "PM"):
+            times += PM_TIMES + [LATE_PM_TIME]
+        return [f"{travel_date}T{hhmm}:00" for hhmm in times]
+
+    def _capacity(self, departure):
+        if departure.endswith(LATE_PM_TIME + ":00"):
+            return self.late_capacity
+        return self.capacity
+
+    def book(self, account, departure):
+        with self.lock:
+            taken = self.departures.setdefault(departure, set())
+            if len(taken) >= self._capacity(departure):
+                return None
+            booking_id = next(self.booking_ids)
+            taken.add(booking_id)
+            self.bookings[booking_id] = [account, departure, True]
+            return booking_id
+
+    def cancel(self, booking_id):
+        with self.lock:
+            booking = self.bookings.get(booking_id)
+            if not booking or not booking[2]:
+                return False
+            booking[2] = False
+            self.departures[booking[1]].discard(booking_id)
+            return True
+
+    # -- endpoints -----------------------------------------------------------
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        return self._dispatch("GET", url, headers, None)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        return self._dispatch("POST", url, headers, data)
+
+    def _dispatch(self, method, url, headers, data):
+        if time.monotonic() > self.deadline:
+            raise SimulationOver()
+
+        # the simulated accounts pass their name as the cookie, like a real
+        # session cookie this works from any thread the request is sent on
+        account = (headers or {}).get("cookie")
+        with self.lock:
+            self.requests[account] = self.requests.get(account, 0) + 1
+
+        parsed = urlparse(url)
+        if method == "GET" and parsed.path.endswith("/bookings/times"):
+            return self._times(parse_qs(parsed.query))
+        if method == "GET" and parsed.path == "/bookings":
+            return self._bookings_page(account)
+        if method == "POST" and parsed.path == "/booking/tickets":
+            return FakeResponse(
+                payload={
+                    "Outbound": {
+                        "MyTickets": [
+                            {"Details": {"Id": 1}, "Activations": {"Remaining": 100}}
+                        ]
+                    }
+                }
+            )
+        if method == "POST" and parsed.path == "/booking":
+            return self._reserve(account, json.loads(data)["objects"][0])
+        m = re.match(r"/booking/cancel/(\d+)$", parsed.path)
+        if method == "POST" and m:
+            self.cancel(int(m.group(1)))
+            return FakeResponse(text="<html></html>")
+        return FakeResponse(404, '"Not found"')
+
+    def _times(self, query):
+        travel_date = query["date"][0]
+        # the morning service picks up in town, the evening one on campus
+        period = "AM" if query["pickupAtcocode"][0] == TOWN_STOP else "PM"
+        items = []
+        with self.lock:
+            for departure in self._departures_on(travel_date, period):
+                items.append(
+                    {
+                        "scheduledDepartureTime": departure,
+                        "lineId": self.line_id,
+                        "bookingOptions": {
+                            "bookings": len(self.departures.get(departure, ())),
+                            "capacity": self._capacity(departure),
+                        },
+                    }
+                )
+        return FakeResponse(payload={"items": items})
+
+    def _bookings_page(self, account):
+        rows = ["<tr><th>Date</th><th>Time</th><th></th></tr>"]
+        with self.lock:
+            for booking_id, (owner, departure, active) in self.bookings.items():
+                if owner != account:
+                    continue
+                dt = datetime.fromisoformat(departure)
+                status = (
+                    f'<form action="/booking/cancel/{booking_id}"></form>'
+                    if active
+                    else "Cancelled"
+                )
+                rows.append(
+                    f"<tr><td>{dt:%d/%m/%Y}</td><td>{dt:%H:%M}</td><td>{status}</td></tr>"
+                )
+        return FakeResponse(text=f'<table class="table">{"".join(rows)}</table>')
+
+    def _reserve(self, account, request):
+        departure = datetime.fromisoformat(request["date"]).isoformat()
+        if departure not in self._departures_on(departure[:10]):
+            return FakeResponse(400, '"This service cannot be found at this time."')
+        booking_id = self.book(account, departure)
+        if booking_id is None:
+            return FakeResponse(400, '"There are no seats left on this service."')
+        with self.lock:
+            self.events.append((account, departure, time.monotonic() - self.start))
+        return FakeResponse(payload={"id": booking_id})
+
+    # -- reporting -----------------------------------------------------------
+
+    def active_slots(self, account):
+        """(date, period) -> number of active bookings held by the account."""
+        slots = {}
+        with self.lock:
+            for owner, departure, active in self.bookings.values():
+                if owner == account and active:
+                    period = "PM" if int(departure[11:13]) >= 12 else "AM"
+                    key = (departure[:10], period)
+                    slots[key] = slots.get(key, 0) + 1
+        return slots
+
+
+def outside_users(hub, today, held, release_probability, interval, stop):
+    """
+    Outside users keep booking free seats on today's PM buses and releasing
+    some of the seats they hold, so seats on popular buses come and go.
+    """
+    departures = [f"{today}T{hhmm}:00" for hhmm in PM_TIMES]
+    while not stop.is_set():
+        if held and random.random() < release_probability:
+            hub.cancel(held.pop(random.randrange(len(held))))
+        else:
+            booking_id = hub.book("outside", random.choice(departures))
+            if booking_id is not None:
+                held.append(booking_id)
+        time.sleep(interval)
+
+
+def run_account(
+    hub, account, config, busroutes, poll_interval, speculative_k, results
+):
+    outcome = {"two_weeks": None, "home_soon": False, "error": None}
+    try:
+        bushub.book_next_two_weeks(config, busroutes, account)
+        outcome["two_weeks"] = True
+    except SimulationOver:
+        pass
+    except Exception as e:
+        outcome["two_weeks"] = False
+        outcome["error"] = str(e) or type(e).__name__
+    try:
+        outcome["home_soon"] = bushub.monitor_and_book_pm_bus(
+            config, busroutes, account, poll_interval, speculative_k
+        )
+    except SimulationOver:
+        pass
+    results[account] = outcome
+
+
+def simulate(accounts, poll_interval, args):
+    today = datetime.now().date().isoformat()
+    day_names = {
+        (datetime.now() + timedelta(days=i)).strftime("%A") for i in range(7)
+    }
+    config = {
+        "days": {
+            day: {
+                "AM": {"pickup": "Town", "dropoff": "Campus"},
+                "PM": {"pickup": "Campus", "dropoff": "Town"},
+            }
+            for day in day_names
+        }
+    }
+    busroutes = {
+        "SIM": {
+            "AM": {
+                "Service": "SIM1",
+                "Stops": {"Town": TOWN_STOP, "Campus": CAMPUS_STOP},
+            },
+            "PM": {
+                "Service": "SIM1",
+                "Stops": {"Campus": CAMPUS_STOP, "Town": TOWN_STOP},
+            },
+        }
+    }
+
+    hub = FakeBusHub("SIM1", args.capacity, accounts, time.monotonic() + args.duration)
+    names = [f"account-{i}" for i in range(accounts)]
+    # every BusHub request from the booking modes now goes to the fake hub
+    bushub.http_session = hub
+
+    # outside users fill today's popular buses first
+    outside_held = []
+    for departure in [f"{today}T{hhmm}:00" for hhmm in PM_TIMES]:
+        booking_id = hub.book("outside", departure)
+        while booking_id is not None:
+            outside_held.append(booking_id)
+            booking_id = hub.book("outside", departure)
+    # every simulated account starts with a seat on the late bus home today
+    seeded = {name: hub.book(name, f"{today}T{LATE_PM_TIME}:00") for name in names}
+
+    stop = threading.Event()
+    outside = threading.Thread(
+        target=outside_users,
+        args=(
+            hub,
+            today,
+            outside_held,
+            args.release_probability,
+            args.outside_interval,
+            stop,
+        ),
+        daemon=True,
+    )
+    outside.start()
+
+    results = {}
+    threads = [
+        threading.Thread(
+            target=run_account,
+            args=(
+                hub,
+                name,
+                config,
+                busroutes,
+                poll_interval,
+                args.speculative_k,
+                results,
+            ),
+            daemon=True,
+        )
+        for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(args.duration + 5)
+    stop.set()
+    outside.join()
+
+    # wanted slots are every weekday AM/PM in the two-week horizon
+    wanted = 2 * len(bushub.get_upcoming_dates(start_date=None))
+    booked_slots = 0
+    double_bookings = 0
+    lost_seats = 0
+    for name in names:
+        slots = hub.active_slots(name)
+        booked_slots += sum(1 for key in slots if key[0] != today)
+        double_bookings += sum(1 for count in slots.values() if count > 1)
+        # the account held a seat home today and ended up with none
+        if seeded[name] is not None and not slots.get((today, "PM")):
+            lost_seats += 1
+
+    account_events = [t for account, _, t in hub.events if account != "outside"]
+    # outside users book directly, so every request comes from an account
+    account_requests = sum(hub.requests.values())
+    overbooked = sum(
+        1
+        for departure, taken in hub.departures.items()
+        if len(taken) > hub._capacity(departure)
+    )
+
+    return {
+        "accounts": accounts,
+        "poll_interval": poll_interval,
+        "two_week_success": booked_slots / (wanted * accounts) if accounts else 0,
+        "home_soon_success": sum(r["home_soon"] for r in results.values()) / accounts,
+        "median_time_to_book": statistics.median(account_events)
+        if account_events
+        else float("nan"),
+        "requests_per_booking": account_requests / len(account_events)
+        if account_events
+        else float("inf"),
+        "double_bookings": double_bookings,
+        "lost_seats": lost_seats,
+        "overbooked_buses": overbooked,
+        "errors": sum(1 for r in results.values() if r["error"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seat-contention load simulator")
+    parser.add_argument(
+        "--accounts",
+        default="1,5,20",
+        help="Comma separated numbers of concurrent simulated accounts (default: 1,5,20)",
+    )
+    parser.add_argument(
+        "--poll-intervals",
+        default="0.05,0.2",
+        help="Comma separated home-soon poll intervals in seconds (default: 0.05,0.2)",
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=8,
+        help="Seats on each regular bus (default: 8)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=5,
+        help="Length of each simulated run in seconds (default: 5)",
+    )
+    parser.add_argument(
+        "--outside-interval",
+        type=float,
+        default=0.02,
+        help="Seconds between outside user actions (default: 0.02)",
+    )
+    parser.add_argument(
+        "--release-probability",
+        type=float,
+        default=0.5,
+        help="Chance an outside user action releases a seat rather than taking one (default: 0.5)",
+    )
+    parser.add_argument(
+        "--speculative-k",
+        type=int,
+        default=1,
+        help="Buses home-soon reserves at once (default: 1, one at a time)",
+    )
+    args = parser.parse_args()
+
+    # the booking modes log every request, keep the report readable
+    log.setLevel(logging.CRITICAL)
+    original_session = bushub.http_session
+    # simulated polls must not end up in the real seat history
+    original_history_dir = bushub.SEAT_HISTORY_DIR
+    bushub.SEAT_HISTORY_DIR = None
+
+    rows = []
+    try:
+        for accounts in [int(x) for x in args.accounts.split(",")]:
+            for poll_interval in [float(x) for x in args.poll_intervals.split(",")]:
+                rows.append(simulate(accounts, poll_interval, args))
+    finally:
+        bushub.http_session = original_session
+        bushub.SEAT_HISTORY_DIR = original_history_dir
+        log.setLevel(logging.INFO)
+
+    header = (
+        f"{'accounts':>8} {'poll s':>7} {'2wk ok':>7} {'home ok':>8} "
+        f"{'t book s':>9} {'req/book':>9} {'double':>7} {'lost':>5} {'over':>5} {'errors':>7}"
+    )
+    print(header)
+    for r in rows:
+        print(
+            f"{r['accounts']:>8} {r['poll_interval']:>7.2f} {r['two_week_success']:>7.0%} "
+            f"{r['home_soon_success']:>8.0%} {r['median_time_to_book']:>9.3f} "
+            f"{r['requests_per_booking']:>9.1f} {r['double_bookings']:>7} "
+            f"{r['lost_seats']:>5} {r['overbooked_buses']:>5} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()